@@ -5,22 +5,243 @@ import sqlite3
 import json
 import os
 import logging
+import threading
+import queue
+import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
+# orjson为可选依赖，用于序列化非标量的设置值
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # 导入NewsItem类
 from src.news_fetcher import NewsItem
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# 日志由应用程序入口统一配置
 logger = logging.getLogger('data_storage')
 
+# 每个连接缓存的预编译语句数量
+_CACHED_STATEMENTS = 256
+
+# 单条SQL语句中绑定参数的上限（SQLite旧版本默认为999）
+_MAX_SQL_PARAMS = 900
+
+# 数据库结构版本，保存在PRAGMA user_version中，用于升级旧版本创建的数据库
+#   1: published_time由ISO-8601文本改为Unix时间戳（整数秒）
+#   2: 新闻标题增加唯一索引，由数据库负责按标题去重
+#   3: 设置值按类型分列保存，布尔值、整数和字符串不再经过JSON编码
+_SCHEMA_VERSION = 3
+
+_SQL_CREATE_NEWS_TABLE = '''
+CREATE TABLE IF NOT EXISTS news_items (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    source TEXT NOT NULL,
+    published_time INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    is_read INTEGER NOT NULL DEFAULT 0
+)
+'''
+
+# 后台写线程收到写请求后，继续等待并合并后续请求的时间窗口（秒）
+_WRITE_BATCH_WINDOW = 0.2
+
+# 两次VACUUM之间的最短间隔（秒）
+_VACUUM_INTERVAL = 7 * 24 * 3600
+
+# VACUUM连接等待其他连接释放写锁的最长时间（秒）
+_VACUUM_BUSY_TIMEOUT = 30
+
+# 逐行插入新闻，用于结构升级，以及SQLite版本不支持RETURNING时保存新闻
+_SQL_INSERT_NEWS = '''
+INSERT OR IGNORE INTO news_items (id, title, link, source, published_time, category, is_read)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+# 以下为高频执行的SQL语句。sqlite3按SQL文本缓存预编译语句，
+# 使用固定的字符串常量可以保证每次都命中缓存，省去重复解析
+
+# 返回给界面的新闻列。display_time为界面显示用的本地时间字符串，
+# 在查询时由SQLite一次性计算
+_NEWS_ROW_COLUMNS = '''id, title, link, source, published_time, category, is_read,
+       strftime('%Y-%m-%d %H:%M', published_time, 'unixepoch', 'localtime') AS display_time'''
+
+# news_items表每行的列数
+_NEWS_COLUMN_COUNT = 7
+
+# INSERT ... RETURNING需要SQLite 3.35及以上版本
+_RETURNING_SUPPORTED = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# 一条多行INSERT语句插入的行数，受绑定参数数量上限约束
+_INSERT_CHUNK_ROWS = _MAX_SQL_PARAMS // _NEWS_COLUMN_COUNT
+
+
+def _sql_insert_news_returning(row_count: int) -> str:
+    """生成一次插入多条新闻并返回新插入行的SQL语句（需要SQLite 3.35及以上）
+    
+    Args:
+        row_count: 插入的行数
+    
+    Returns:
+        SQL语句
+    """
+    placeholders = ", ".join(["(" + ", ".join("?" * _NEWS_COLUMN_COUNT) + ")"] * row_count)
+    return f'''
+    INSERT OR IGNORE INTO news_items (id, title, link, source, published_time, category, is_read)
+    VALUES {placeholders}
+    RETURNING {_NEWS_ROW_COLUMNS}
+    '''
+
+
+# 只使用两种固定的行数生成语句，保证每次都命中预编译语句缓存：
+# 满块使用多行语句，不足一块的剩余行逐行插入
+_SQL_INSERT_NEWS_CHUNK_RETURNING = _sql_insert_news_returning(_INSERT_CHUNK_ROWS)
+_SQL_INSERT_NEWS_RETURNING = _sql_insert_news_returning(1)
+
+_SQL_SELECT_LATEST_NEWS = f'''
+SELECT {_NEWS_ROW_COLUMNS}
+FROM news_items
+ORDER BY published_time DESC
+LIMIT ?
+'''
+
+_SQL_SELECT_UNREAD_NEWS = f'''
+SELECT {_NEWS_ROW_COLUMNS}
+FROM news_items
+WHERE is_read = 0
+ORDER BY published_time DESC
+LIMIT ?
+'''
+
+_SQL_MARK_AS_READ = '''
+UPDATE news_items
+SET is_read = 1
+WHERE id IN ({placeholders})
+'''
+
+_SQL_SELECT_NEWS_BY_IDS = f'''
+SELECT {_NEWS_ROW_COLUMNS}
+FROM news_items
+WHERE id IN ({{placeholders}})
+'''
+
+_SQL_CREATE_SETTINGS_TABLE = '''
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value_type TEXT NOT NULL,
+    value_int INTEGER,
+    value_text TEXT
+)
+'''
+
+_SQL_UPSERT_SETTING = '''
+INSERT INTO settings (key, value_type, value_int, value_text)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(key) DO UPDATE SET
+    value_type = excluded.value_type,
+    value_int = excluded.value_int,
+    value_text = excluded.value_text
+'''
+
+# SQLite INTEGER列可保存的整数范围
+_SQLITE_INT_MIN = -2 ** 63
+_SQLITE_INT_MAX = 2 ** 63 - 1
+
+
+def _json_dumps(value: Any) -> str:
+    """将值序列化为JSON字符串，优先使用orjson"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # orjson不支持的值交给标准库处理
+            pass
+    return json.dumps(value)
+
+
+def _json_loads(text: str) -> Any:
+    """解析JSON字符串，优先使用orjson"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _encode_setting(value: Any) -> Tuple[str, Optional[int], Optional[str]]:
+    """将设置值编码为settings表的(value_type, value_int, value_text)三列
+    
+    Args:
+        value: 设置值
+    
+    Returns:
+        值类型和对应的列值
+    """
+    # bool是int的子类，需要先判断
+    if isinstance(value, bool):
+        return "bool", int(value), None
+    if isinstance(value, int):
+        if _SQLITE_INT_MIN <= value <= _SQLITE_INT_MAX:
+            return "int", value, None
+        # 超出INTEGER范围的整数以十进制文本保存
+        return "int", None, str(value)
+    if isinstance(value, str):
+        return "str", None, value
+    return "json", None, _json_dumps(value)
+
+
+def _decode_setting(value_type: str, value_int: Optional[int], value_text: Optional[str]) -> Any:
+    """将settings表的三列解码为设置值
+    
+    Args:
+        value_type: 值类型
+        value_int: 整数列
+        value_text: 文本列
+    
+    Returns:
+        设置值
+    """
+    if value_type == "bool":
+        return bool(value_int)
+    if value_type == "int":
+        return value_int if value_int is not None else int(value_text)
+    if value_type == "str":
+        return value_text
+    return _json_loads(value_text)
+
+
+def news_item_from_row(row: sqlite3.Row) -> NewsItem:
+    """将news_items表的查询结果行转换为NewsItem对象
+    
+    Args:
+        row: 包含news_items全部列的查询结果行
+    
+    Returns:
+        新闻条目
+    """
+    item = NewsItem(
+        title=row["title"],
+        link=row["link"],
+        source=row["source"],
+        published_time=datetime.fromtimestamp(row["published_time"]),
+        category=row["category"],
+        is_read=bool(row["is_read"])
+    )
+    item.id = row["id"]
+    return item
+
+
 class DataStorage:
-    """数据存储类，负责管理本地SQLite数据库"""
+    """数据存储类，负责管理本地SQLite数据库
+    
+    整个对象生命周期内只持有一个数据库连接，由可重入锁保护，
+    可以同时被GUI线程和后台刷新线程使用。标记已读等轻量写操作由后台写线程
+    批量提交，调用方不会被磁盘同步阻塞。使用完毕后应调用close()。
+    """
     
     def __init__(self, db_path: str = None):
         """初始化数据存储对象
@@ -35,302 +256,614 @@ class DataStorage:
             db_path = os.path.join(app_data_dir, "news_data.db")
         
         self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = self._connect()
         self._init_database()
+        
+        # 设置项很少且很少修改，全部缓存在内存中，由save_settings_bulk同步更新
+        self._settings_cache: Dict[str, Any] = self._load_all_settings()
+        
+        # 后台写线程：从队列中取出待标记为已读的新闻ID，合并到一个事务中提交
+        self._write_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop,
+            name="DataStorageWriter",
+            daemon=True
+        )
+        self._writer_thread.start()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """打开数据库连接，并应用针对本应用的连接级PRAGMA设置"""
+        # 连接会在多个线程间共享，访问由self._lock串行化。
+        # isolation_level=None关闭sqlite3模块的隐式事务：读操作不开启事务，
+        # 写操作用BEGIN IMMEDIATE显式开始，一开始就取得写锁，
+        # 避免延迟事务在读锁升级为写锁时遇到SQLITE_BUSY
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=_CACHED_STATEMENTS
+        )
+        # 查询结果按列名访问，界面层可以直接使用结果行，按需再构造NewsItem
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+        # WAL模式下NORMAL同步级别已能保证数据库一致性，且提交时无需每次fsync
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        # 临时表和排序使用内存
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        # 页缓存约20MB（负数表示以KB为单位）
+        cursor.execute("PRAGMA cache_size=-20000")
+        # 通过内存映射读取数据页，减少读取时的系统调用
+        cursor.execute("PRAGMA mmap_size=268435456")
+        return conn
     
     def _init_database(self):
         """初始化数据库结构"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 创建新闻表
+        with self._lock:
+            try:
+                cursor = self._conn.cursor()
+                
+                # 启用WAL日志模式（数据库级设置，会持久保存在数据库文件中），
+                # 读操作不会被写操作阻塞
+                cursor.execute("PRAGMA journal_mode=WAL")
+                
+                cursor.execute("BEGIN IMMEDIATE")
+                
+                # 创建新闻表
+                cursor.execute(_SQL_CREATE_NEWS_TABLE)
+                
+                # 升级旧版本的数据库结构
+                self._migrate_schema(cursor)
+                
+                # 标题唯一索引：重复标题的新闻在插入时被直接忽略
+                cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_news_title
+                ON news_items (title)
+                ''')
+                
+                # 按发布时间倒序读取新闻列表时使用的索引
+                cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_news_pub
+                ON news_items (published_time DESC)
+                ''')
+                
+                # 只包含未读新闻的部分索引，get_unread_news只需读取前limit个索引项
+                cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_news_unread
+                ON news_items (published_time DESC)
+                WHERE is_read = 0
+                ''')
+                
+                # 创建设置表
+                cursor.execute(_SQL_CREATE_SETTINGS_TABLE)
+                
+                # 创建新闻源表
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS news_sources (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    is_enabled INTEGER NOT NULL DEFAULT 1
+                )
+                ''')
+                
+                self._conn.commit()
+                logger.info("数据库初始化成功")
+            except Exception as e:
+                self._conn.rollback()
+                logger.error("数据库初始化失败: %s", e)
+    
+    def _migrate_schema(self, cursor: sqlite3.Cursor):
+        """将数据库结构升级到当前版本（在_init_database的事务中调用）
+        
+        Args:
+            cursor: 数据库游标
+        """
+        cursor.execute("PRAGMA user_version")
+        version = cursor.fetchone()[0]
+        if version >= _SCHEMA_VERSION:
+            return
+        
+        if version < 1:
+            # 旧版本以ISO-8601文本保存发布时间，转换为整数时间戳后按数值排序，
+            # 无需在读取时解析字符串，索引也更小
+            cursor.execute("PRAGMA table_info(news_items)")
+            column_types = {row["name"]: row["type"].upper() for row in cursor.fetchall()}
+            if column_types.get("published_time") == "TEXT":
+                cursor.execute("ALTER TABLE news_items RENAME TO news_items_old")
+                cursor.execute(_SQL_CREATE_NEWS_TABLE)
+                cursor.execute('''
+                SELECT id, title, link, source, published_time, category, is_read
+                FROM news_items_old
+                ''')
+                rows = [
+                    (
+                        row["id"],
+                        row["title"],
+                        row["link"],
+                        row["source"],
+                        int(datetime.fromisoformat(row["published_time"]).timestamp()),
+                        row["category"],
+                        row["is_read"]
+                    )
+                    for row in cursor.fetchall()
+                ]
+                cursor.executemany(_SQL_INSERT_NEWS, rows)
+                # 旧表上的索引会随旧表一起删除，稍后在新表上重建
+                cursor.execute("DROP TABLE news_items_old")
+                logger.info("已将%d条新闻的发布时间转换为时间戳", len(rows))
+        
+        if version < 2:
+            # 创建唯一索引前删除标题重复的条目，只保留最早写入的一条
             cursor.execute('''
-            CREATE TABLE IF NOT EXISTS news_items (
-                id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                link TEXT NOT NULL,
-                source TEXT NOT NULL,
-                published_time TEXT NOT NULL,
-                category TEXT NOT NULL,
-                is_read INTEGER NOT NULL DEFAULT 0
+            DELETE FROM news_items
+            WHERE rowid NOT IN (
+                SELECT MIN(rowid) FROM news_items GROUP BY title
             )
             ''')
+            if cursor.rowcount > 0:
+                logger.info("删除了%d条标题重复的新闻", cursor.rowcount)
+        
+        if version < 3:
+            # 旧版本把所有设置值编码为JSON字符串保存在value列中，转换为按类型分列保存
+            cursor.execute("PRAGMA table_info(settings)")
+            if "value" in {row["name"] for row in cursor.fetchall()}:
+                cursor.execute("SELECT key, value FROM settings")
+                rows = [
+                    (row["key"],) + _encode_setting(json.loads(row["value"]))
+                    for row in cursor.fetchall()
+                ]
+                cursor.execute("DROP TABLE settings")
+                cursor.execute(_SQL_CREATE_SETTINGS_TABLE)
+                cursor.executemany(_SQL_UPSERT_SETTING, rows)
+                logger.info("已转换%d项设置的存储格式", len(rows))
+        
+        cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+    
+    def _writer_loop(self):
+        """后台写线程主循环"""
+        while True:
+            # 队列中的每一项是一组新闻ID，None表示停止
+            news_ids = self._write_queue.get()
+            received = 1
+            stopping = news_ids is None
+            batch = set() if stopping else set(news_ids)
             
-            # 创建设置表
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS settings (
-                key TEXT PRIMARY KEY,
-                value TEXT NOT NULL
-            )
-            ''')
+            # 在时间窗口内继续收集写请求，短时间内的多次点击只提交一次
+            deadline = time.monotonic() + _WRITE_BATCH_WINDOW
+            while not stopping:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    news_ids = self._write_queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                received += 1
+                if news_ids is None:
+                    stopping = True
+                else:
+                    batch.update(news_ids)
             
-            # 创建新闻源表
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS news_sources (
-                id TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                url TEXT NOT NULL,
-                category TEXT NOT NULL,
-                is_enabled INTEGER NOT NULL DEFAULT 1
-            )
-            ''')
+            if batch:
+                self._write_read_marks(list(batch))
             
-            conn.commit()
-            logger.info("数据库初始化成功")
-        except Exception as e:
-            logger.error(f"数据库初始化失败: {str(e)}")
-        finally:
-            if conn:
+            for _ in range(received):
+                self._write_queue.task_done()
+            
+            if stopping:
+                break
+    
+    def _write_read_marks(self, news_ids: List[str]):
+        """在一个事务中将一批新闻标记为已读（由后台写线程调用）
+        
+        Args:
+            news_ids: 新闻ID列表
+        """
+        with self._lock:
+            if self._conn is None:
+                logger.error("标记新闻为已读失败: 数据库已关闭")
+                return
+            try:
+                cursor = self._conn.cursor()
+                
+                cursor.execute("BEGIN IMMEDIATE")
+                # 每条UPDATE用IN列表更新一批新闻，批次大小受SQLite参数个数上限约束
+                for start in range(0, len(news_ids), _MAX_SQL_PARAMS):
+                    chunk = news_ids[start:start + _MAX_SQL_PARAMS]
+                    placeholders = ", ".join("?" * len(chunk))
+                    cursor.execute(_SQL_MARK_AS_READ.format(placeholders=placeholders), chunk)
+                
+                self._conn.commit()
+                logger.info("将%d条新闻标记为已读", len(news_ids))
+            except Exception as e:
+                self._conn.rollback()
+                logger.error("标记新闻为已读失败: %s", e)
+    
+    def flush(self):
+        """等待后台写线程提交所有已排队的写操作"""
+        if self._writer_thread.is_alive():
+            self._write_queue.join()
+    
+    def close(self):
+        """关闭数据库连接，应在应用退出时调用
+        
+        关闭前会先提交后台写线程中尚未写入的操作。
+        """
+        if self._writer_thread.is_alive():
+            self._write_queue.put(None)
+            self._writer_thread.join()
+        
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                # 根据本次连接中的查询情况更新查询规划器的统计信息
+                self._conn.execute("PRAGMA optimize")
+            except Exception as e:
+                logger.error("优化数据库失败: %s", e)
+            try:
+                self._conn.close()
+                logger.info("数据库连接已关闭")
+            except Exception as e:
+                logger.error("关闭数据库连接失败: %s", e)
+            finally:
+                self._conn = None
+    
+    def maintain(self) -> bool:
+        """定期维护数据库，距上次VACUUM超过一周时整理数据库文件
+        
+        VACUUM可能耗时较长，应在后台线程中调用。VACUUM使用单独的临时连接执行，
+        不占用共享连接的锁，执行期间界面线程的读操作不受影响。
+        
+        Returns:
+            本次是否执行了VACUUM
+        """
+        if self._conn is None:
+            logger.error("数据库VACUUM失败: 数据库已关闭")
+            return False
+        
+        now = int(time.time())
+        if now - self.get_setting("last_vacuum", 0) < _VACUUM_INTERVAL:
+            return False
+        
+        try:
+            # VACUUM不能在事务中执行，自动提交模式下直接执行即可；
+            # 遇到正在进行的写事务时最多等待_VACUUM_BUSY_TIMEOUT秒
+            conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=_VACUUM_BUSY_TIMEOUT)
+            try:
+                conn.execute("VACUUM")
+            finally:
                 conn.close()
+            logger.info("数据库VACUUM完成")
+        except Exception as e:
+            logger.error("数据库VACUUM失败: %s", e)
+            return False
+        
+        self.save_setting("last_vacuum", now)
+        return True
     
     def save_news_items(self, items: List[NewsItem]) -> int:
         """保存新闻条目到数据库
         
         Args:
             items: 新闻条目列表
-            
+        
         Returns:
             保存成功的条目数量
         """
+        return len(self.insert_news_items(items))
+    
+    def insert_news_items(self, items: List[NewsItem]) -> List[sqlite3.Row]:
+        """保存新闻条目到数据库，并返回实际新插入的条目
+        
+        ID或标题已存在的条目会被忽略。返回的行与get_latest_rows的格式相同，
+        界面可以直接把它们加入列表，而不必重新查询。
+        
+        Args:
+            items: 新闻条目列表
+        
+        Returns:
+            新插入条目的查询结果行列表，按发布时间倒序排列
+        """
         if not items:
-            return 0
+            return []
         
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            saved_count = 0
-            for item in items:
-                try:
-                    # 检查是否已存在
-                    cursor.execute("SELECT id FROM news_items WHERE title = ?", (item.title,))
-                    if cursor.fetchone() is not None:
-                        continue
-                    
-                    # 插入新闻条目
-                    cursor.execute('''
-                    INSERT INTO news_items (id, title, link, source, published_time, category, is_read)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
+        with self._lock:
+            if self._conn is None:
+                logger.error("保存新闻条目到数据库失败: 数据库已关闭")
+                return []
+            try:
+                cursor = self._conn.cursor()
+                
+                rows = [
+                    (
                         item.id,
                         item.title,
                         item.link,
                         item.source,
-                        item.published_time.isoformat(),
+                        int(item.published_time.timestamp()),
                         item.category,
                         1 if item.is_read else 0
-                    ))
-                    saved_count += 1
-                except Exception as e:
-                    logger.error(f"保存新闻条目失败: {str(e)}")
+                    )
+                    for item in items
+                ]
+                
+                # 整批写入放在一个显式事务中，只提交（fsync）一次。
+                # ID或标题已存在的条目（包括本批次内的重复标题）由主键和标题唯一索引
+                # 在插入时直接忽略，无需事先查询
+                cursor.execute("BEGIN IMMEDIATE")
+                if _RETURNING_SUPPORTED:
+                    inserted = self._insert_rows_returning(cursor, rows)
+                else:
+                    inserted = self._insert_rows_then_select(cursor, rows)
+                
+                self._conn.commit()
+                
+                # RETURNING和IN查询都不保证返回顺序
+                inserted.sort(key=lambda row: row["published_time"], reverse=True)
+                logger.info("成功保存%d条新闻", len(inserted))
+                return inserted
+            except Exception as e:
+                self._conn.rollback()
+                logger.error("保存新闻条目到数据库失败: %s", e)
+                return []
+    
+    def _insert_rows_returning(self, cursor: sqlite3.Cursor, rows: List[tuple]) -> List[sqlite3.Row]:
+        """用INSERT ... RETURNING插入新闻，RETURNING只返回真正插入的行
+        
+        Args:
+            cursor: 处于写事务中的数据库游标
+            rows: 待插入的行
+        
+        Returns:
+            新插入条目的查询结果行列表（顺序不定）
+        """
+        inserted = []
+        full_end = len(rows) - len(rows) % _INSERT_CHUNK_ROWS
+        for start in range(0, full_end, _INSERT_CHUNK_ROWS):
+            chunk = rows[start:start + _INSERT_CHUNK_ROWS]
+            cursor.execute(_SQL_INSERT_NEWS_CHUNK_RETURNING, [value for row in chunk for value in row])
+            inserted.extend(cursor.fetchall())
+        for row in rows[full_end:]:
+            cursor.execute(_SQL_INSERT_NEWS_RETURNING, row)
+            inserted.extend(cursor.fetchall())
+        return inserted
+    
+    def _insert_rows_then_select(self, cursor: sqlite3.Cursor, rows: List[tuple]) -> List[sqlite3.Row]:
+        """SQLite低于3.35时的保存方式：逐行插入，再按ID查询真正插入的行
+        
+        Args:
+            cursor: 处于写事务中的数据库游标
+            rows: 待插入的行
+        
+        Returns:
+            新插入条目的查询结果行列表（顺序不定）
+        """
+        # INSERT OR IGNORE忽略的行rowcount为0，据此得到新插入条目的ID
+        new_ids = []
+        for row in rows:
+            cursor.execute(_SQL_INSERT_NEWS, row)
+            if cursor.rowcount > 0:
+                new_ids.append(row[0])
+        
+        inserted = []
+        for start in range(0, len(new_ids), _MAX_SQL_PARAMS):
+            chunk = new_ids[start:start + _MAX_SQL_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor.execute(_SQL_SELECT_NEWS_BY_IDS.format(placeholders=placeholders), chunk)
+            inserted.extend(cursor.fetchall())
+        return inserted
+    
+    def get_latest_rows(self, limit: int = 10) -> List[sqlite3.Row]:
+        """获取最新新闻条目的原始查询结果行
+        
+        与get_latest_news相同，但不构造NewsItem对象，
+        供只需要显示部分字段的界面列表使用。
+        
+        Args:
+            limit: 返回的最大条目数
+        
+        Returns:
+            查询结果行列表，可按列名访问；除news_items的全部列外，
+            还包含格式化好的本地发布时间display_time（如"2025-05-24 10:30"）
+        """
+        try:
+            with self._lock:
+                if self._conn is None:
+                    logger.error("获取最新新闻失败: 数据库已关闭")
+                    return []
+                
+                cursor = self._conn.cursor()
+                
+                cursor.execute(_SQL_SELECT_LATEST_NEWS, (limit,))
+                
+                rows = cursor.fetchall()
             
-            conn.commit()
-            logger.info(f"成功保存{saved_count}条新闻")
-            return saved_count
+            logger.info("获取了%d条最新新闻", len(rows))
+            return rows
         except Exception as e:
-            logger.error(f"保存新闻条目到数据库失败: {str(e)}")
-            return 0
-        finally:
-            if conn:
-                conn.close()
+            logger.error("获取最新新闻失败: %s", e)
+            return []
     
     def get_latest_news(self, limit: int = 10) -> List[NewsItem]:
         """获取最新的新闻条目
         
         Args:
             limit: 返回的最大条目数
-            
+        
         Returns:
             新闻条目列表
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            SELECT id, title, link, source, published_time, category, is_read
-            FROM news_items
-            ORDER BY published_time DESC
-            LIMIT ?
-            ''', (limit,))
-            
-            rows = cursor.fetchall()
-            news_items = []
-            
-            for row in rows:
-                item = NewsItem(
-                    title=row[1],
-                    link=row[2],
-                    source=row[3],
-                    published_time=datetime.fromisoformat(row[4]),
-                    category=row[5],
-                    is_read=bool(row[6])
-                )
-                item.id = row[0]
-                news_items.append(item)
-            
-            logger.info(f"获取了{len(news_items)}条最新新闻")
+            rows = self.get_latest_rows(limit)
+            news_items = [news_item_from_row(row) for row in rows]
             return news_items
         except Exception as e:
-            logger.error(f"获取最新新闻失败: {str(e)}")
+            logger.error("获取最新新闻失败: %s", e)
             return []
-        finally:
-            if conn:
-                conn.close()
     
     def get_unread_news(self, limit: int = 10) -> List[NewsItem]:
         """获取未读的新闻条目
         
         Args:
             limit: 返回的最大条目数
-            
+        
         Returns:
             新闻条目列表
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            with self._lock:
+                if self._conn is None:
+                    logger.error("获取未读新闻失败: 数据库已关闭")
+                    return []
+                
+                cursor = self._conn.cursor()
+                
+                cursor.execute(_SQL_SELECT_UNREAD_NEWS, (limit,))
+                
+                rows = cursor.fetchall()
             
-            cursor.execute('''
-            SELECT id, title, link, source, published_time, category, is_read
-            FROM news_items
-            WHERE is_read = 0
-            ORDER BY published_time DESC
-            LIMIT ?
-            ''', (limit,))
+            news_items = [news_item_from_row(row) for row in rows]
             
-            rows = cursor.fetchall()
-            news_items = []
-            
-            for row in rows:
-                item = NewsItem(
-                    title=row[1],
-                    link=row[2],
-                    source=row[3],
-                    published_time=datetime.fromisoformat(row[4]),
-                    category=row[5],
-                    is_read=bool(row[6])
-                )
-                item.id = row[0]
-                news_items.append(item)
-            
-            logger.info(f"获取了{len(news_items)}条未读新闻")
+            logger.info("获取了%d条未读新闻", len(news_items))
             return news_items
         except Exception as e:
-            logger.error(f"获取未读新闻失败: {str(e)}")
+            logger.error("获取未读新闻失败: %s", e)
             return []
-        finally:
-            if conn:
-                conn.close()
     
     def mark_as_read(self, news_id: str) -> bool:
         """将新闻标记为已读
         
+        写操作交给后台写线程异步提交，本方法立即返回。
+        需要立即读到结果时可调用flush()。
+        
         Args:
             news_id: 新闻ID
-            
+        
         Returns:
-            操作是否成功
+            是否成功加入写队列
         """
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            UPDATE news_items
-            SET is_read = 1
-            WHERE id = ?
-            ''', (news_id,))
-            
-            conn.commit()
-            logger.info(f"将新闻 {news_id} 标记为已读")
-            return True
-        except Exception as e:
-            logger.error(f"标记新闻为已读失败: {str(e)}")
+        return self.mark_many_as_read([news_id])
+    
+    def mark_many_as_read(self, news_ids: List[str]) -> bool:
+        """将一批新闻标记为已读
+        
+        与mark_as_read相同，写操作交给后台写线程异步提交。
+        
+        Args:
+            news_ids: 新闻ID列表
+        
+        Returns:
+            是否成功加入写队列
+        """
+        if not self._writer_thread.is_alive():
+            logger.error("标记新闻为已读失败: 数据库已关闭")
             return False
-        finally:
-            if conn:
-                conn.close()
+        
+        if news_ids:
+            self._write_queue.put(list(news_ids))
+            logger.info("将%d条新闻加入已读写队列", len(news_ids))
+        return True
     
     def save_setting(self, key: str, value: Any) -> bool:
         """保存设置
         
         Args:
             key: 设置键
-            value: 设置值（将被转换为JSON字符串）
-            
+            value: 设置值
+        
         Returns:
             操作是否成功
         """
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 将值转换为JSON字符串
-            value_json = json.dumps(value)
-            
-            # 检查是否已存在
-            cursor.execute("SELECT key FROM settings WHERE key = ?", (key,))
-            if cursor.fetchone() is not None:
-                # 更新
-                cursor.execute('''
-                UPDATE settings
-                SET value = ?
-                WHERE key = ?
-                ''', (value_json, key))
-            else:
-                # 插入
-                cursor.execute('''
-                INSERT INTO settings (key, value)
-                VALUES (?, ?)
-                ''', (key, value_json))
-            
-            conn.commit()
-            logger.info(f"保存设置 {key}")
+        return self.save_settings_bulk({key: value})
+    
+    def save_settings_bulk(self, settings: Dict[str, Any]) -> bool:
+        """在一个事务中保存多项设置
+        
+        Args:
+            settings: 设置键到设置值的字典。布尔值、整数和字符串按类型直接保存，
+                其他值转换为JSON字符串
+        
+        Returns:
+            操作是否成功
+        """
+        if not settings:
             return True
-        except Exception as e:
-            logger.error(f"保存设置失败: {str(e)}")
-            return False
-        finally:
-            if conn:
-                conn.close()
+        
+        with self._lock:
+            if self._conn is None:
+                logger.error("保存设置失败: 数据库已关闭")
+                return False
+            try:
+                cursor = self._conn.cursor()
+                
+                rows = [(key,) + _encode_setting(value) for key, value in settings.items()]
+                
+                # 插入或更新，每项设置只需一条语句
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.executemany(_SQL_UPSERT_SETTING, rows)
+                
+                self._conn.commit()
+                
+                # 同步更新内存缓存，缓存的值与从数据库重新读取的结果一致。
+                # 先复制再整体替换字典，读取方无需加锁即可看到完整的新旧版本之一
+                settings_cache = dict(self._settings_cache)
+                settings_cache.update(
+                    (row[0], _decode_setting(*row[1:])) for row in rows
+                )
+                self._settings_cache = settings_cache
+                logger.info("保存设置 %s", ', '.join(settings))
+                return True
+            except Exception as e:
+                self._conn.rollback()
+                logger.error("保存设置失败: %s", e)
+                return False
     
     def get_setting(self, key: str, default: Any = None) -> Any:
         """获取设置
         
+        设置在初始化时一次性加载到内存中，读取时不访问数据库，也不等待数据库锁。
+        
         Args:
             key: 设置键
             default: 默认值（如果设置不存在）
-            
+        
         Returns:
             设置值
         """
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            SELECT value
-            FROM settings
-            WHERE key = ?
-            ''', (key,))
-            
-            row = cursor.fetchone()
-            if row is not None:
-                # 从JSON字符串转换回Python对象
-                return json.loads(row[0])
-            else:
-                return default
-        except Exception as e:
-            logger.error(f"获取设置失败: {str(e)}")
-            return default
-        finally:
-            if conn:
-                conn.close()
+        # 缓存字典只会被整体替换、不会被原地修改，无需加锁
+        return self._settings_cache.get(key, default)
+    
+    def _load_all_settings(self) -> Dict[str, Any]:
+        """从数据库中读取全部设置
+        
+        Returns:
+            设置键到设置值的字典
+        """
+        settings = {}
+        with self._lock:
+            try:
+                cursor = self._conn.cursor()
+                cursor.execute("SELECT key, value_type, value_int, value_text FROM settings")
+                for row in cursor.fetchall():
+                    settings[row["key"]] = _decode_setting(
+                        row["value_type"], row["value_int"], row["value_text"]
+                    )
+            except Exception as e:
+                logger.error("获取设置失败: %s", e)
+        return settings
 
 
 # 测试代码
 if __name__ == "__main__":
+    # 单独运行本模块时配置日志
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     from news_fetcher import NewsFetcher
     
     # 使用临时数据库文件进行测试
@@ -368,6 +901,7 @@ if __name__ == "__main__":
     enabled = storage.get_setting("notification_enabled", False)
     print(f"\n设置: refresh_interval={interval}, notification_enabled={enabled}")
     
-    # 清理测试文件
+    # 关闭数据库连接并清理测试文件
+    storage.close()
     if os.path.exists(test_db_path):
         os.remove(test_db_path)
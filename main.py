@@ -4,11 +4,9 @@
 import sys
 import os
 import logging
-import threading
 import time
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-import webbrowser
 
 # 配置日志
 logging.basicConfig(
@@ -19,51 +17,163 @@ logger = logging.getLogger('main_app')
 
 # 导入自定义模块
 from news_fetcher import NewsFetcher, NewsItem
-from data_storage import DataStorage
+from data_storage import DataStorage, news_item_from_row
 from notification import NotificationManager
 
 # PyQt6导入
 try:
     from PyQt6.QtWidgets import (
         QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-        QPushButton, QLabel, QListWidget, QListWidgetItem, QTabWidget,
+        QPushButton, QLabel, QListView, QTabWidget,
         QSystemTrayIcon, QMenu, QDialog, QCheckBox, QSpinBox, QFormLayout,
         QGroupBox, QScrollArea, QSplitter, QFrame, QToolBar, QStatusBar,
         QMessageBox
     )
-    from PyQt6.QtCore import Qt, QSize, QTimer, pyqtSignal, QUrl
-    from PyQt6.QtGui import QIcon, QAction, QFont, QDesktopServices, QColor, QPalette
+    from PyQt6.QtCore import (
+        Qt, QSize, QTimer, pyqtSignal, QUrl, QAbstractListModel, QModelIndex,
+        QRunnable, QThreadPool
+    )
+    from PyQt6.QtGui import QIcon, QAction, QFont, QDesktopServices, QColor, QPalette, QBrush
     GUI_AVAILABLE = True
 except ImportError:
     logger.warning("PyQt6库未安装，GUI功能将不可用")
     GUI_AVAILABLE = False
 
 
-class NewsListItem(QListWidgetItem):
-    """自定义列表项，用于显示新闻条目"""
+# 已读/未读新闻的文字颜色，所有列表行共享同一个画刷对象
+READ_BRUSH = QBrush(QColor(120, 120, 120))  # 灰色表示已读
+UNREAD_BRUSH = QBrush(QColor(0, 0, 0))  # 黑色表示未读
+
+# 新闻列表项的工具提示模板
+NEWS_TOOLTIP_TEMPLATE = "来源: {source}\n分类: {category}\n发布时间: {published_time}"
+
+
+class NewsListModel(QAbstractListModel):
+    """新闻列表数据模型
+    
+    直接保存数据库查询结果行（sqlite3.Row），由QListView按需读取可见行的数据，
+    不再为每条新闻创建列表项对象。
+    """
+    
+    # 获取对应NewsItem对象的数据角色
+    NewsItemRole = Qt.ItemDataRole.UserRole
     
-    def __init__(self, news_item: NewsItem):
-        """初始化新闻列表项
+    def __init__(self, max_rows: int, parent=None):
+        """初始化新闻列表模型
         
         Args:
-            news_item: 新闻条目
+            max_rows: 列表最多显示的新闻条数
+            parent: 父对象
         """
-        super().__init__()
-        self.news_item = news_item
+        super().__init__(parent)
+        self.max_rows = max_rows
+        self._rows = []
+        self._news_items = {}  # 已构造的NewsItem对象，按新闻ID缓存
+        self._read_ids = set()  # 加载后被标记为已读的新闻ID
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        """返回行数"""
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """返回指定行在指定角色下的数据
+        
+        Args:
+            index: 行索引
+            role: 数据角色
+        """
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        
+        row = self._rows[index.row()]
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            # 显示文本
+            return row["title"]
+        
+        if role == Qt.ItemDataRole.ToolTipRole:
+            # 工具提示
+            return NEWS_TOOLTIP_TEMPLATE.format(
+                source=row["source"],
+                category=row["category"],
+                published_time=row["display_time"]
+            )
         
-        # 设置显示文本
-        self.setText(f"{news_item.title}")
+        if role == Qt.ItemDataRole.ForegroundRole:
+            # 已读/未读状态的样式
+            return READ_BRUSH if self._is_read(row) else UNREAD_BRUSH
         
-        # 设置工具提示
-        self.setToolTip(f"来源: {news_item.source}\n"
-                        f"分类: {news_item.category}\n"
-                        f"发布时间: {news_item.published_time.strftime('%Y-%m-%d %H:%M')}")
+        if role == self.NewsItemRole:
+            # 对应的新闻条目，在第一次访问（如用户点击）时才构造
+            news_item = self._news_items.get(row["id"])
+            if news_item is None:
+                news_item = news_item_from_row(row)
+                self._news_items[row["id"]] = news_item
+            return news_item
         
-        # 设置已读/未读状态的样式
-        if news_item.is_read:
-            self.setForeground(QColor(120, 120, 120))  # 灰色表示已读
+        return None
+    
+    def set_rows(self, rows):
+        """替换模型中的全部数据
+        
+        Args:
+            rows: 新闻查询结果行列表
+        """
+        self.beginResetModel()
+        self._rows = list(rows[:self.max_rows])
+        self._news_items.clear()
+        self._read_ids.clear()
+        self.endResetModel()
+    
+    def add_rows(self, rows):
+        """将新插入数据库的新闻加入列表，保持按发布时间倒序，并只保留前max_rows条
+        
+        Args:
+            rows: 新闻查询结果行列表，按发布时间倒序排列
+        """
+        if not rows:
+            return
+        
+        if not self._rows or rows[-1]["published_time"] >= self._rows[0]["published_time"]:
+            # 常见情况：新获取的新闻都比列表中已有的新闻更新，一次性插入到列表顶部
+            rows = rows[:self.max_rows]
+            self.beginInsertRows(QModelIndex(), 0, len(rows) - 1)
+            self._rows[0:0] = rows
+            self.endInsertRows()
+            
+            # 超出上限的旧新闻从列表末尾移除
+            if len(self._rows) > self.max_rows:
+                self.beginRemoveRows(QModelIndex(), self.max_rows, len(self._rows) - 1)
+                del self._rows[self.max_rows:]
+                self.endRemoveRows()
         else:
-            self.setForeground(QColor(0, 0, 0))  # 黑色表示未读
+            # 新新闻需要插入到已有新闻之间时，合并后整体刷新
+            merged = sorted(
+                self._rows + list(rows),
+                key=lambda row: row["published_time"],
+                reverse=True
+            )
+            self.beginResetModel()
+            self._rows = merged[:self.max_rows]
+            self.endResetModel()
+    
+    def mark_read(self, news_id: str):
+        """将指定新闻显示为已读
+        
+        Args:
+            news_id: 新闻ID
+        """
+        self._read_ids.add(news_id)
+        for i, row in enumerate(self._rows):
+            if row["id"] == news_id:
+                index = self.index(i)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.ForegroundRole])
+    
+    def _is_read(self, row) -> bool:
+        """判断新闻是否已读"""
+        return bool(row["is_read"]) or row["id"] in self._read_ids
 
 
 class SettingsDialog(QDialog):
@@ -159,6 +269,11 @@ class SettingsDialog(QDialog):
 class MainWindow(QMainWindow):
     """主窗口"""
     
+    # 后台获取新闻的结果：新插入的新闻行列表、是否显示通知
+    news_fetched = pyqtSignal(list, bool)
+    # 后台获取新闻失败，参数为错误信息
+    news_fetch_failed = pyqtSignal(str)
+    
     def __init__(self):
         """初始化主窗口"""
         super().__init__()
@@ -174,6 +289,13 @@ class MainWindow(QMainWindow):
         
         self.notification_manager = NotificationManager()
         
+        # 获取新闻使用单线程的线程池，线程常驻复用，同一时间最多只有一个刷新任务在执行
+        self.fetch_pool = QThreadPool(self)
+        self.fetch_pool.setMaxThreadCount(1)
+        self.fetch_pool.setExpiryTimeout(-1)
+        self.news_fetched.connect(self._on_news_fetched)
+        self.news_fetch_failed.connect(self._on_news_fetch_failed)
+        
         # 设置窗口属性
         self.setWindowTitle("AI科技新闻通知")
         self.setMinimumSize(800, 600)
@@ -192,6 +314,16 @@ class MainWindow(QMainWindow):
         self.refresh_timer.timeout.connect(self.auto_refresh_news)
         self.start_refresh_timer()
         
+        # 点击新闻后并不立即写库，短时间内的多次点击合并为一次批量写入
+        self._pending_read = set()
+        self._read_flush_timer = QTimer(self)
+        self._read_flush_timer.setSingleShot(True)
+        self._read_flush_timer.setInterval(200)
+        self._read_flush_timer.timeout.connect(self.flush_reads)
+        
+        # 显示数据库中已有的新闻，之后的刷新只需加入新获取的新闻
+        self.update_news_lists()
+        
         # 初始加载新闻
         self.refresh_news()
     
@@ -225,8 +357,11 @@ class MainWindow(QMainWindow):
         self.latest_tab = QWidget()
         latest_layout = QVBoxLayout(self.latest_tab)
         
-        self.latest_list = QListWidget()
-        self.latest_list.itemDoubleClicked.connect(self.on_news_item_clicked)
+        self.latest_model = NewsListModel(20, self)
+        self.latest_list = QListView()
+        self.latest_list.setModel(self.latest_model)
+        self.latest_list.setUniformItemSizes(True)
+        self.latest_list.doubleClicked.connect(self.on_news_item_clicked)
         latest_layout.addWidget(self.latest_list)
         
         self.tabs.addTab(self.latest_tab, "最新新闻")
@@ -235,8 +370,11 @@ class MainWindow(QMainWindow):
         self.history_tab = QWidget()
         history_layout = QVBoxLayout(self.history_tab)
         
-        self.history_list = QListWidget()
-        self.history_list.itemDoubleClicked.connect(self.on_news_item_clicked)
+        self.history_model = NewsListModel(100, self)
+        self.history_list = QListView()
+        self.history_list.setModel(self.history_model)
+        self.history_list.setUniformItemSizes(True)
+        self.history_list.doubleClicked.connect(self.on_news_item_clicked)
         history_layout.addWidget(self.history_list)
         
         self.tabs.addTab(self.history_tab, "历史记录")
@@ -319,7 +457,7 @@ class MainWindow(QMainWindow):
         # 显示提示消息
         self.tray_icon.showMessage(
             "AI科技新闻通知",
-            "应用程序仍在后台运行。要完全退出，请右键点击托盘图标并选择"退出"。",
+            "应用程序仍在后台运行。要完全退出，请右键点击托盘图标并选择“退出”。",
             QSystemTrayIcon.MessageIcon.Information,
             3000
         )
@@ -332,6 +470,19 @@ class MainWindow(QMainWindow):
         # 停止定时器
         self.refresh_timer.stop()
         
+        # 取消排队中的刷新任务，并等待正在执行的任务结束
+        self.fetch_pool.clear()
+        self.fetch_pool.waitForDone()
+        
+        # 提交尚未写入的已读标记
+        self.flush_reads()
+        
+        # 停止通知调度线程
+        self.notification_manager.close()
+        
+        # 关闭数据库连接
+        self.storage.close()
+        
         # 退出应用
         QApplication.quit()
     
@@ -353,15 +504,13 @@ class MainWindow(QMainWindow):
     
     def save_settings(self):
         """保存设置"""
-        # 保存通知设置
-        self.storage.save_setting("notification_enabled", self.notification_enabled)
-        
-        # 保存刷新间隔
-        self.storage.save_setting("refresh_interval", self.refresh_interval)
-        
-        # 保存启动设置
-        self.storage.save_setting("auto_start", self.auto_start)
-        self.storage.save_setting("start_minimized", self.start_minimized)
+        # 通知设置、刷新间隔和启动设置在一个事务中保存
+        self.storage.save_settings_bulk({
+            "notification_enabled": self.notification_enabled,
+            "refresh_interval": self.refresh_interval,
+            "auto_start": self.auto_start,
+            "start_minimized": self.start_minimized
+        })
         
         # 如果启用了自启动，设置注册表
         self.set_auto_start(self.auto_start)
@@ -443,75 +592,81 @@ class MainWindow(QMainWindow):
         """
         self.statusBar.showMessage("正在获取最新新闻...")
         
-        # 在后台线程中获取新闻
-        threading.Thread(target=self._fetch_news_thread, args=(show_notification,), daemon=True).start()
+        # 在后台线程池中获取新闻
+        self.fetch_pool.start(FetchTask(self, show_notification))
     
-    def _fetch_news_thread(self, show_notification: bool):
-        """后台线程获取新闻
+    def _on_news_fetched(self, new_rows: list, show_notification: bool):
+        """后台获取新闻完成（在主线程中执行）
         
         Args:
+            new_rows: 新插入数据库的新闻查询结果行列表
             show_notification: 是否显示通知
         """
-        try:
-            # 获取新闻
-            news_items = self.fetcher.fetch_all_news()
+        # 更新状态栏
+        if new_rows:
+            self.statusBar.showMessage(f"获取到{len(new_rows)}条新闻")
             
-            # 保存到数据库
-            saved_count = self.storage.save_news_items(news_items)
+            # 只把新插入的新闻加入列表，无需重新查询数据库
+            self.latest_model.add_rows(new_rows)
+            self.history_model.add_rows(new_rows)
             
-            # 在主线程中更新UI
-            QApplication.instance().postEvent(
-                self,
-                NewsRefreshEvent(saved_count, show_notification)
-            )
-        except Exception as e:
-            logger.error(f"获取新闻失败: {str(e)}")
-            
-            # 在主线程中更新状态
-            QApplication.instance().postEvent(
-                self,
-                NewsRefreshErrorEvent(str(e))
-            )
+            # 如果有新闻且需要通知，显示通知
+            if show_notification:
+                self.show_notifications([news_item_from_row(row) for row in new_rows])
+        else:
+            self.statusBar.showMessage("没有新的新闻")
+    
+    def _on_news_fetch_failed(self, error_message: str):
+        """后台获取新闻失败（在主线程中执行）
+        
+        Args:
+            error_message: 错误信息
+        """
+        # 更新状态栏
+        self.statusBar.showMessage(f"获取新闻失败: {error_message}")
     
     def update_news_lists(self):
         """更新新闻列表"""
-        # 清空列表
-        self.latest_list.clear()
-        self.history_list.clear()
-        
-        # 获取最新新闻
-        latest_news = self.storage.get_latest_news(20)
+        # 只查询一次：历史记录取最近100条，最新新闻就是其中的前20条
+        all_news = self.storage.get_latest_rows(self.history_model.max_rows)
         
         # 更新最新新闻列表
-        for news_item in latest_news:
-            list_item = NewsListItem(news_item)
-            self.latest_list.addItem(list_item)
-        
-        # 获取所有新闻作为历史记录
-        all_news = self.storage.get_latest_news(100)
+        self.latest_model.set_rows(all_news)
         
         # 更新历史记录列表
-        for news_item in all_news:
-            list_item = NewsListItem(news_item)
-            self.history_list.addItem(list_item)
+        self.history_model.set_rows(all_news)
     
-    def on_news_item_clicked(self, item):
+    def on_news_item_clicked(self, index):
         """新闻条目点击事件处理
         
         Args:
-            item: 点击的列表项
+            index: 点击的列表项索引
         """
         # 获取新闻条目
-        news_item = item.news_item
+        news_item = index.data(NewsListModel.NewsItemRole)
+        if news_item is None:
+            return
         
-        # 打开浏览器访问新闻链接
+        # 打开浏览器访问新闻链接，webbrowser较重且只在点击时需要，按需导入
+        import webbrowser
         webbrowser.open(news_item.link)
         
-        # 标记为已读
-        self.storage.mark_as_read(news_item.id)
+        # 标记为已读，由定时器批量写入数据库
+        self._pending_read.add(news_item.id)
+        self._read_flush_timer.start()
         
-        # 更新列表项样式
-        item.setForeground(QColor(120, 120, 120))
+        # 更新两个列表中该新闻的样式
+        self.latest_model.mark_read(news_item.id)
+        self.history_model.mark_read(news_item.id)
+    
+    def flush_reads(self):
+        """将排队的已读标记一次性写入数据库"""
+        self._read_flush_timer.stop()
+        if not self._pending_read:
+            return
+        
+        self.storage.mark_many_as_read(list(self._pending_read))
+        self._pending_read.clear()
     
     def show_notifications(self, news_items: List[NewsItem]):
         """显示新闻通知
@@ -525,22 +680,61 @@ class MainWindow(QMainWindow):
         # 最多显示3条通知
         items_to_show = news_items[:3]
         
-        # 显示通知
-        self.notification_manager.show_multiple_news_notifications(items_to_show)
+        # 通知加入后台队列依次显示，返回值为排队的数量而非已显示的数量
+        queued_count = self.notification_manager.show_multiple_news_notifications(items_to_show)
+        logger.info(f"已将{queued_count}条新闻加入通知队列")
+
+
+class FetchTask(QRunnable):
+    """后台获取新闻任务，在主窗口的线程池中执行"""
     
-    def event(self, event):
-        """事件处理
+    def __init__(self, window: "MainWindow", show_notification: bool):
+        """初始化获取新闻任务
         
         Args:
-            event: 事件对象
-            
-        Returns:
-            是否处理了事件
+            window: 主窗口
+            show_notification: 是否显示通知
         """
-        if isinstance(event, NewsRefreshEvent):
-            # 更新状态栏
-            if event.saved_count > 0:
-                self.statusBar.showMessage(f"获取到{event.saved_count}条新闻")
-                
-                # 如果有新
-(Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
+        super().__init__()
+        self.window = window
+        self.show_notification = show_notification
+    
+    def run(self):
+        """获取新闻并保存到数据库，结果通过信号发送回主线程"""
+        try:
+            # 获取新闻
+            news_items = self.window.fetcher.fetch_all_news()
+            
+            # 保存到数据库，只取回真正新插入的条目
+            new_rows = self.window.storage.insert_news_items(news_items)
+            
+            # 信号跨线程发送时以排队方式在主线程中处理
+            self.window.news_fetched.emit(new_rows, self.show_notification)
+            
+            # 借用后台线程顺便做定期数据库维护，不阻塞界面
+            self.window.storage.maintain()
+        except Exception as e:
+            logger.error(f"获取新闻失败: {str(e)}")
+            self.window.news_fetch_failed.emit(str(e))
+
+
+def main():
+    """应用程序入口"""
+    if not GUI_AVAILABLE:
+        logger.error("PyQt6库未安装，无法启动应用程序")
+        sys.exit(1)
+    
+    app = QApplication(sys.argv)
+    
+    # 关闭主窗口时应用程序继续在托盘中运行
+    app.setQuitOnLastWindowClosed(False)
+    
+    window = MainWindow()
+    if not window.start_minimized:
+        window.show()
+    
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
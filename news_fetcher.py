@@ -1,23 +1,379 @@
 """
 新闻获取模块 - 负责从多个来源获取AI和科技相关新闻
 """
-import requests
+import asyncio
+import functools
+import hashlib
+import io
 import json
-import feedparser
-from datetime import datetime
-import time
+import os
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import logging
-from typing import List, Dict, Any, Optional
+import re
+from operator import attrgetter
+from typing import List, Dict, Any, Optional, Pattern, Sequence, Tuple
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# 日志由应用程序入口统一配置
 logger = logging.getLogger('news_fetcher')
 
+# aiohttp用于并发下载RSS订阅源
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    logger.warning("aiohttp库未安装，将无法从RSS订阅源下载新闻")
+    AIOHTTP_AVAILABLE = False
+
+# pyahocorasick为可选依赖，未安装时使用正则表达式匹配关键词
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# lxml用于解析下载的RSS/Atom订阅源
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    logger.warning("lxml库未安装，将无法解析RSS订阅源")
+    LXML_AVAILABLE = False
+
+# orjson为可选依赖，用于更快地解析NewsAPI响应，未安装时使用标准库json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# RFC 822日期中的英文月份缩写
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12
+}
+
+
+def _parse_rfc822(value: str) -> datetime:
+    """解析RSS订阅源中的RFC 822格式发布时间
+    
+    形如"Sat, 24 May 2025 10:30:00 GMT"的定长字符串直接按位置切片解析，
+    其他格式（数字时区偏移、时区名称等）交给email.utils解析并转换为UTC。
+    
+    Args:
+        value: 发布时间字符串
+    
+    Returns:
+        不带时区信息的datetime对象
+    
+    Raises:
+        ValueError: 无法解析时间字符串
+    """
+    if len(value) == 29 and value.endswith(" GMT"):
+        try:
+            return datetime(
+                int(value[12:16]), _MONTHS[value[8:11]], int(value[5:7]),
+                int(value[17:19]), int(value[20:22]), int(value[23:25])
+            )
+        except (KeyError, ValueError):
+            pass
+    
+    try:
+        published_time = parsedate_to_datetime(value)
+    except (TypeError, IndexError) as e:
+        # 旧版本Python在无法解析时抛出的不是ValueError
+        raise ValueError(f"无法解析发布时间: {value}") from e
+    
+    # 时区为-0000时返回不带时区的时间，按UTC处理
+    if published_time.tzinfo is not None:
+        published_time = published_time.astimezone(timezone.utc).replace(tzinfo=None)
+    return published_time
+
+
+def _parse_newsapi_time(value: str) -> datetime:
+    """解析NewsAPI返回的ISO 8601格式发布时间，如"2025-05-24T15:30:00Z"
+    
+    去掉结尾的Z后交给fromisoformat解析，得到不带时区信息的datetime对象。
+    
+    Args:
+        value: 发布时间字符串
+    
+    Returns:
+        不带时区信息的datetime对象
+    """
+    return datetime.fromisoformat(value.removesuffix("Z"))
+
+
+def _parse_feed_time(value: str) -> datetime:
+    """解析订阅源中的发布时间
+    
+    RSS的pubDate使用RFC 822格式，Atom的published/updated使用ISO 8601格式。
+    带时区的时间统一转换为UTC。
+    
+    Args:
+        value: 发布时间字符串
+    
+    Returns:
+        不带时区信息的datetime对象
+    
+    Raises:
+        ValueError: 无法解析时间字符串
+    """
+    if not value[:4].isdigit():
+        return _parse_rfc822(value)
+    
+    published_time = datetime.fromisoformat(value.removesuffix("Z"))
+    if published_time.tzinfo is not None:
+        published_time = published_time.astimezone(timezone.utc).replace(tzinfo=None)
+    return published_time
+
+
+def _describe_feed_error(error: Exception) -> str:
+    """区分下载失败和解析失败，生成订阅源错误的说明
+    
+    Args:
+        error: 获取订阅源时抛出的异常
+    
+    Returns:
+        错误说明
+    """
+    if AIOHTTP_AVAILABLE:
+        if isinstance(error, aiohttp.ClientResponseError):
+            return f"下载失败，HTTP状态码{error.status} {error.message}"
+        if isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError)):
+            return f"下载失败，{type(error).__name__}: {error}"
+    return f"解析失败，{type(error).__name__}: {error}"
+
+
+# Atom订阅源的XML命名空间
+_ATOM_NS = "{http://www.w3.org/2005/Atom}"
+
+# 每个订阅源最多提取的条目数量
+_MAX_FEED_ENTRIES = 50
+
+
+def _parse_feed(body: bytes, max_entries: int = _MAX_FEED_ENTRIES) -> List[Dict[str, Any]]:
+    """流式解析RSS 2.0或Atom订阅源，只提取标题、链接和发布时间
+    
+    订阅源按时间倒序排列，取到max_entries条后即停止解析，已处理的元素随即释放，
+    内存占用与订阅源大小无关。解析器不展开实体、不访问网络，防止XML实体注入。
+    
+    Args:
+        body: 订阅源的XML内容
+        max_entries: 最多提取的条目数量
+    
+    Returns:
+        条目列表，每个条目为包含title、link和published（可能缺失）的字典
+    """
+    context = etree.iterparse(
+        io.BytesIO(body),
+        events=("end",),
+        tag=("item", f"{_ATOM_NS}entry"),
+        resolve_entities=False,
+        no_network=True
+    )
+    
+    entries = []
+    for _, elem in context:
+        if elem.tag == "item":
+            title = elem.findtext("title")
+            link = elem.findtext("link")
+            published = elem.findtext("pubDate")
+        else:
+            # 优先使用rel为alternate（或未指定rel）的链接
+            link = None
+            for link_elem in elem.iter(f"{_ATOM_NS}link"):
+                if link_elem.get("rel", "alternate") == "alternate":
+                    link = link_elem.get("href")
+                    break
+            title = elem.findtext(f"{_ATOM_NS}title")
+            published = elem.findtext(f"{_ATOM_NS}published") or elem.findtext(f"{_ATOM_NS}updated")
+        
+        # 释放已处理的元素及其之前的兄弟节点
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+        
+        # 跳过缺少标题或链接的条目
+        if not title or not link:
+            continue
+        
+        entry = {"title": title.strip(), "link": link.strip()}
+        if published:
+            entry["published"] = published.strip()
+        entries.append(entry)
+        
+        if len(entries) >= max_entries:
+            break
+    
+    return entries
+
+
+def _compile_keywords_pattern(keywords: Sequence[str]) -> Pattern[str]:
+    """将关键词列表编译为一个忽略大小写、匹配任一关键词的正则表达式
+    
+    Args:
+        keywords: 关键词列表
+    
+    Returns:
+        编译后的正则表达式
+    """
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=8)
+def _build_keyword_matcher(ai_keywords: Tuple[str, ...], tech_keywords: Tuple[str, ...]):
+    """构建关键词匹配器，同一组关键词只构建一次
+    
+    安装了pyahocorasick时构建Aho-Corasick自动机，
+    否则为AI关键词和科技关键词各编译一个忽略大小写的正则表达式。
+    同一关键词同时出现在两个列表中时以AI分类为准。
+    
+    Args:
+        ai_keywords: 小写的AI关键词
+        tech_keywords: 小写的科技关键词
+    
+    Returns:
+        关键词匹配器
+    """
+    if not AHOCORASICK_AVAILABLE:
+        return (
+            _compile_keywords_pattern(ai_keywords),
+            _compile_keywords_pattern(tech_keywords)
+        )
+    
+    # 先加入科技关键词，再加入AI关键词，使AI分类覆盖重复的关键词
+    automaton = ahocorasick.Automaton()
+    for keyword in tech_keywords:
+        automaton.add_word(keyword, "科技")
+    for keyword in ai_keywords:
+        automaton.add_word(keyword, "AI")
+    automaton.make_automaton()
+    return automaton
+
+
+@functools.lru_cache(maxsize=4096)
+def _categorize_title(title: str, ai_keywords: Tuple[str, ...], tech_keywords: Tuple[str, ...]) -> str:
+    """根据标题中的关键词对新闻进行分类，结果按标题缓存
+    
+    不同来源转载的同一标题只需匹配一次关键词。
+    
+    Args:
+        title: 新闻标题
+        ai_keywords: 小写的AI关键词
+        tech_keywords: 小写的科技关键词
+    
+    Returns:
+        新闻分类
+    """
+    matcher = _build_keyword_matcher(ai_keywords, tech_keywords)
+    
+    # 出现任一AI关键词即归为AI，否则出现科技关键词时归为科技
+    if not AHOCORASICK_AVAILABLE:
+        ai_pattern, tech_pattern = matcher
+        if ai_pattern.search(title):
+            return "AI"
+        if tech_pattern.search(title):
+            return "科技"
+        return "AI/科技"
+    
+    has_tech_keyword = False
+    for _, category in matcher.iter(title.lower()):
+        if category == "AI":
+            return "AI"
+        has_tech_keyword = True
+    
+    if has_tech_keyword:
+        return "科技"
+    
+    # 默认分类
+    return "AI/科技"
+
+
+# NewsAPI接口地址
+_NEWSAPI_URL = "https://newsapi.org/v2/everything"
+
+# 未配置NewsAPI密钥时使用的占位值
+_NEWSAPI_KEY_PLACEHOLDER = "YOUR_NEWSAPI_KEY"
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """读取布尔型环境变量，"0"、"false"、"no"、"off"（不区分大小写）视为关闭
+    
+    Args:
+        name: 环境变量名
+        default: 未设置该环境变量时的取值
+    
+    Returns:
+        开关是否打开
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ("", "0", "false", "no", "off")
+
+
+# 模拟的NewsAPI响应
+MOCK_NEWSAPI_RESPONSE = {
+    "status": "ok",
+    "totalResults": 3,
+    "articles": [
+        {
+            "source": {"id": "techcrunch", "name": "TechCrunch"},
+            "title": "最新GPT-5模型展示惊人的推理能力",
+            "url": "https://techcrunch.com/2025/05/24/gpt-5-reasoning/",
+            "publishedAt": "2025-05-24T15:30:00Z"
+        },
+        {
+            "source": {"id": "wired", "name": "Wired"},
+            "title": "量子计算突破：首个实用级容错量子处理器问世",
+            "url": "https://www.wired.com/2025/05/quantum-computing-breakthrough/",
+            "publishedAt": "2025-05-24T12:15:00Z"
+        },
+        {
+            "source": {"id": "theverge", "name": "The Verge"},
+            "title": "新型脑机接口技术允许完全瘫痪患者控制机器人手臂",
+            "url": "https://www.theverge.com/2025/5/23/brain-computer-interface",
+            "publishedAt": "2025-05-23T18:45:00Z"
+        }
+    ]
+}
+
+# 模拟的RSS订阅源条目，键为订阅源名称
+MOCK_RSS_ENTRIES = {
+    "MIT Technology Review": [
+        {
+            "title": "新型神经形态芯片模拟人脑突触连接",
+            "link": "https://www.technologyreview.com/2025/05/24/neuromorphic-chip/",
+            "published": "Sat, 24 May 2025 10:30:00 GMT"
+        },
+        {
+            "title": "AI辅助药物发现平台缩短新药研发周期",
+            "link": "https://www.technologyreview.com/2025/05/23/ai-drug-discovery/",
+            "published": "Fri, 23 May 2025 14:15:00 GMT"
+        }
+    ],
+    "AI News": [
+        {
+            "title": "多模态AI系统实现跨领域知识迁移",
+            "link": "https://artificialintelligence-news.com/2025/05/24/multimodal-ai/",
+            "published": "Sat, 24 May 2025 09:45:00 GMT"
+        },
+        {
+            "title": "自监督学习突破：AI模型仅需少量标注数据即可达到SOTA",
+            "link": "https://artificialintelligence-news.com/2025/05/22/self-supervised-learning/",
+            "published": "Thu, 22 May 2025 16:20:00 GMT"
+        }
+    ]
+}
+
+
 class NewsItem:
     """新闻条目数据结构"""
+    
+    # 使用__slots__代替实例字典，减少大量新闻条目占用的内存
+    __slots__ = ("id", "title", "link", "source", "published_time", "category", "is_read")
+    
     def __init__(self, 
                  title: str, 
                  link: str, 
@@ -25,7 +381,11 @@ class NewsItem:
                  published_time: datetime,
                  category: str = "AI/科技",
                  is_read: bool = False):
-        self.id = f"{source}_{int(time.time())}_{hash(title) % 10000}"
+        # 由来源、标题和发布时间确定ID，重复获取同一条新闻时ID不变
+        self.id = hashlib.blake2b(
+            f"{source}|{title}|{published_time.isoformat()}".encode("utf-8"),
+            digest_size=12
+        ).hexdigest()
         self.title = title
         self.link = link
         self.source = source
@@ -65,7 +425,14 @@ class NewsFetcher:
     
     def __init__(self):
         # 新闻API密钥和配置
-        self.newsapi_key = "YOUR_NEWSAPI_KEY"  # 实际使用时需要替换为真实的API密钥
+        # 通过环境变量配置API密钥，例如：NEWSAPI_KEY=... python main.py
+        self.newsapi_key = os.environ.get("NEWSAPI_KEY", _NEWSAPI_KEY_PLACEHOLDER)
+        
+        # RSS订阅源是否使用模拟数据，NEWS_USE_MOCK_DATA=0时从订阅源实际下载
+        self.use_mock_data = _env_flag("NEWS_USE_MOCK_DATA", True)
+        
+        # NewsAPI是否使用模拟数据，仅供开发调试，需通过NEWSAPI_USE_MOCK=1显式打开
+        self.use_mock_newsapi = _env_flag("NEWSAPI_USE_MOCK", False)
         
         # 科技和AI相关的RSS订阅源
         self.rss_feeds = [
@@ -103,105 +470,129 @@ class NewsFetcher:
             "VR", "AR", "XR", "机器人", "自动驾驶", "物联网", "IoT", "5G", "6G",
             "半导体", "芯片", "云计算", "边缘计算"
         ]
+        
+        # 预先转换为小写的关键词，避免每次分类时重复调用lower()
+        self._ai_kw_lc = tuple(keyword.lower() for keyword in self.ai_keywords)
+        self._tech_kw_lc = tuple(keyword.lower() for keyword in self.tech_keywords)
     
     def fetch_from_newsapi(self) -> List[NewsItem]:
-        """从NewsAPI获取新闻"""
+        """从NewsAPI获取新闻
+        
+        设置了NEWSAPI_USE_MOCK=1时返回模拟数据，用于开发调试；否则未配置API密钥
+        （为空或仍是占位值）时直接返回空列表，配置了密钥时调用NewsAPI接口。
+        该行为与RSS订阅源的use_mock_data开关无关。
+        
+        Returns:
+            新闻条目列表
+        """
+        if not self.use_mock_newsapi and self.newsapi_key in ("", _NEWSAPI_KEY_PLACEHOLDER):
+            # 未配置API密钥时直接跳过
+            return []
+        
         logger.info("从NewsAPI获取新闻...")
         
-        # 由于实际环境中需要API密钥，这里使用模拟数据
-        # 实际使用时应替换为真实API调用
         try:
-            # 模拟API响应
-            mock_response = {
-                "status": "ok",
-                "totalResults": 3,
-                "articles": [
-                    {
-                        "source": {"id": "techcrunch", "name": "TechCrunch"},
-                        "title": "最新GPT-5模型展示惊人的推理能力",
-                        "url": "https://techcrunch.com/2025/05/24/gpt-5-reasoning/",
-                        "publishedAt": "2025-05-24T15:30:00Z"
-                    },
-                    {
-                        "source": {"id": "wired", "name": "Wired"},
-                        "title": "量子计算突破：首个实用级容错量子处理器问世",
-                        "url": "https://www.wired.com/2025/05/quantum-computing-breakthrough/",
-                        "publishedAt": "2025-05-24T12:15:00Z"
-                    },
-                    {
-                        "source": {"id": "theverge", "name": "The Verge"},
-                        "title": "新型脑机接口技术允许完全瘫痪患者控制机器人手臂",
-                        "url": "https://www.theverge.com/2025/5/23/brain-computer-interface",
-                        "publishedAt": "2025-05-23T18:45:00Z"
-                    }
-                ]
-            }
+            if self.use_mock_newsapi:
+                articles = MOCK_NEWSAPI_RESPONSE["articles"]
+            else:
+                articles = self._request_newsapi_articles()
             
             news_items = []
-            for article in mock_response["articles"]:
-                # 确保所有datetime对象都是naive的（不带时区信息）
-                dt_str = article["publishedAt"].replace("Z", "")
-                dt = datetime.fromisoformat(dt_str)
+            for article in articles:
+                # 跳过缺少标题或链接的文章
+                if not article.get("title") or not article.get("url"):
+                    continue
                 
                 news_items.append(NewsItem(
                     title=article["title"],
                     link=article["url"],
                     source=article["source"]["name"],
-                    published_time=dt,
+                    published_time=_parse_newsapi_time(article["publishedAt"]),
                     category=self._categorize_by_keywords(article["title"])
                 ))
             
-            logger.info(f"从NewsAPI获取了{len(news_items)}条新闻")
+            logger.info("从NewsAPI获取了%d条新闻", len(news_items))
             return news_items
             
         except Exception as e:
-            logger.error(f"从NewsAPI获取新闻失败: {str(e)}")
+            logger.error("从NewsAPI获取新闻失败: %s", e)
             return []
     
-    def fetch_from_rss(self) -> List[NewsItem]:
-        """从RSS订阅源获取新闻"""
+    def _request_newsapi_articles(self) -> List[Dict[str, Any]]:
+        """调用NewsAPI接口获取最新的AI和科技文章
+        
+        Returns:
+            NewsAPI返回的文章列表
+        """
+        # requests只在真正调用接口时需要，按需导入
+        import requests
+        
+        response = requests.get(
+            _NEWSAPI_URL,
+            params={"q": "AI OR 人工智能 OR 科技", "sortBy": "publishedAt", "pageSize": 50},
+            headers={"X-Api-Key": self.newsapi_key},
+            timeout=10
+        )
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
+        return data.get("articles", [])
+    
+    async def _fetch_feed_entries(self, session, feed_info: Dict[str, str]) -> List[Dict[str, Any]]:
+        """下载并解析单个RSS订阅源
+        
+        Args:
+            session: aiohttp会话
+            feed_info: 订阅源配置
+        
+        Returns:
+            订阅源中的条目列表
+        """
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with session.get(feed_info["url"], timeout=timeout) as response:
+            # 4xx/5xx返回的通常是HTML错误页，不交给XML解析器
+            response.raise_for_status()
+            
+            # 以字节形式交给lxml，由XML声明决定编码
+            body = await response.read()
+        
+        return _parse_feed(body)
+    
+    async def fetch_from_rss_async(self) -> List[NewsItem]:
+        """并发地从所有RSS订阅源获取新闻"""
         logger.info("从RSS订阅源获取新闻...")
         
+        if self.use_mock_data:
+            # 使用模拟数据
+            results = [MOCK_RSS_ENTRIES.get(feed_info["name"], []) for feed_info in self.rss_feeds]
+        elif not AIOHTTP_AVAILABLE or not LXML_AVAILABLE:
+            logger.error("aiohttp或lxml库未安装，无法获取RSS新闻")
+            return []
+        else:
+            # 所有订阅源共用一个会话并发下载，总耗时取决于最慢的订阅源
+            connector = aiohttp.TCPConnector(limit=16)
+            async with aiohttp.ClientSession(connector=connector) as session:
+                results = await asyncio.gather(
+                    *[self._fetch_feed_entries(session, feed_info) for feed_info in self.rss_feeds],
+                    return_exceptions=True
+                )
+        
+        # 缺少发布时间的条目统一使用本批次的获取时间，只读取一次时钟
+        fetch_time = datetime.now()
+        
         news_items = []
-        for feed_info in self.rss_feeds:
+        for feed_info, entries in zip(self.rss_feeds, results):
+            if isinstance(entries, Exception):
+                logger.error("从%s获取RSS新闻失败: %s", feed_info['name'], _describe_feed_error(entries))
+                continue
+            
             try:
-                # 实际环境中应该使用真实的RSS解析
-                # 这里使用模拟数据
-                if feed_info["name"] == "MIT Technology Review":
-                    mock_entries = [
-                        {
-                            "title": "新型神经形态芯片模拟人脑突触连接",
-                            "link": "https://www.technologyreview.com/2025/05/24/neuromorphic-chip/",
-                            "published": "Sat, 24 May 2025 10:30:00 GMT"
-                        },
-                        {
-                            "title": "AI辅助药物发现平台缩短新药研发周期",
-                            "link": "https://www.technologyreview.com/2025/05/23/ai-drug-discovery/",
-                            "published": "Fri, 23 May 2025 14:15:00 GMT"
-                        }
-                    ]
-                elif feed_info["name"] == "AI News":
-                    mock_entries = [
-                        {
-                            "title": "多模态AI系统实现跨领域知识迁移",
-                            "link": "https://artificialintelligence-news.com/2025/05/24/multimodal-ai/",
-                            "published": "Sat, 24 May 2025 09:45:00 GMT"
-                        },
-                        {
-                            "title": "自监督学习突破：AI模型仅需少量标注数据即可达到SOTA",
-                            "link": "https://artificialintelligence-news.com/2025/05/22/self-supervised-learning/",
-                            "published": "Thu, 22 May 2025 16:20:00 GMT"
-                        }
-                    ]
-                else:
-                    mock_entries = []
-                
-                for entry in mock_entries:
+                for entry in entries:
                     try:
                         # 确保所有datetime对象都是naive的（不带时区信息）
-                        published_time = datetime.strptime(entry["published"], "%a, %d %b %Y %H:%M:%S GMT")
-                    except ValueError:
-                        published_time = datetime.now().replace(tzinfo=None)
+                        published_time = _parse_feed_time(entry["published"])
+                    except (KeyError, ValueError):
+                        published_time = fetch_time
                     
                     news_items.append(NewsItem(
                         title=entry["title"],
@@ -212,54 +603,53 @@ class NewsFetcher:
                     ))
                 
             except Exception as e:
-                logger.error(f"从{feed_info['name']}获取RSS新闻失败: {str(e)}")
+                logger.error("从%s获取RSS新闻失败: %s", feed_info['name'], e)
         
-        logger.info(f"从RSS订阅源获取了{len(news_items)}条新闻")
+        logger.info("从RSS订阅源获取了%d条新闻", len(news_items))
         return news_items
     
-    def fetch_all_news(self) -> List[NewsItem]:
-        """获取所有来源的新闻并合并"""
-        all_news = []
+    def fetch_from_rss(self) -> List[NewsItem]:
+        """从RSS订阅源获取新闻（fetch_from_rss_async的同步版本）"""
+        return asyncio.run(self.fetch_from_rss_async())
+    
+    async def fetch_all_news_async(self) -> List[NewsItem]:
+        """并发地获取所有来源的新闻并合并"""
+        # NewsAPI在线程中执行，与RSS订阅源的下载同时进行
+        newsapi_news, rss_news = await asyncio.gather(
+            asyncio.to_thread(self.fetch_from_newsapi),
+            self.fetch_from_rss_async()
+        )
         
-        # 从各个来源获取新闻
-        all_news.extend(self.fetch_from_newsapi())
-        all_news.extend(self.fetch_from_rss())
+        all_news = newsapi_news + rss_news
         
         # 按发布时间排序，最新的在前
-        all_news.sort(key=lambda x: x.published_time, reverse=True)
-        
-        # 去重（基于标题）
-        unique_titles = set()
-        unique_news = []
+        all_news.sort(key=attrgetter("published_time"), reverse=True)
         
-        for item in all_news:
-            if item.title not in unique_titles:
-                unique_titles.add(item.title)
-                unique_news.append(item)
+        # 去重（基于标题），同一标题只保留最新的一条
+        # 字符串对象会缓存自身的哈希值，直接以标题为键比先计算标题摘要再以整数为键更快
+        seen = set()
+        unique_news = [item for item in all_news if not (item.title in seen or seen.add(item.title))]
         
-        logger.info(f"总共获取了{len(unique_news)}条不重复的新闻")
+        logger.info("总共获取了%d条不重复的新闻", len(unique_news))
         return unique_news
     
+    def fetch_all_news(self) -> List[NewsItem]:
+        """获取所有来源的新闻并合并（fetch_all_news_async的同步版本）"""
+        return asyncio.run(self.fetch_all_news_async())
+    
     def _categorize_by_keywords(self, title: str) -> str:
         """根据标题中的关键词对新闻进行分类"""
-        title_lower = title.lower()
-        
-        # 检查AI关键词
-        for keyword in self.ai_keywords:
-            if keyword.lower() in title_lower:
-                return "AI"
-        
-        # 检查科技关键词
-        for keyword in self.tech_keywords:
-            if keyword.lower() in title_lower:
-                return "科技"
-        
-        # 默认分类
-        return "AI/科技"
+        return _categorize_title(title, self._ai_kw_lc, self._tech_kw_lc)
 
 
 # 测试代码
 if __name__ == "__main__":
+    # 单独运行本模块时配置日志
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     fetcher = NewsFetcher()
     news = fetcher.fetch_all_news()
     
@@ -3,18 +3,17 @@
 """
 import os
 import sys
+import functools
 import logging
-import webbrowser
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import threading
+import queue
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# 日志由应用程序入口统一配置
 logger = logging.getLogger('notification')
 
 # 导入NewsItem类
@@ -36,8 +35,28 @@ except ImportError:
             pass
             
         def show_toast(self, title, msg, icon_path, duration, callback_on_click):
-            logger.info(f"模拟通知: {title} - {msg}")
-            logger.info(f"点击回调: {callback_on_click}")
+            logger.info("模拟通知: %s - %s", title, msg)
+            logger.info("点击回调: %s", callback_on_click)
+
+
+@functools.lru_cache(maxsize=1)
+def _find_icon_path() -> Optional[str]:
+    """查找通知图标路径，结果在进程内缓存，只访问一次磁盘"""
+    # 在实际应用中，图标应该放在应用安装目录下
+    # 这里使用一个临时路径
+    app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    icon_path = os.path.join(app_dir, "assets", "icon.ico")
+    
+    # 如果图标不存在，返回None
+    if not os.path.exists(icon_path):
+        logger.warning("通知图标不存在: %s", icon_path)
+        return None
+    
+    return icon_path
+
+
+# 最多保留的活动通知回调数量，超出时丢弃最早的通知
+_MAX_ACTIVE_NOTIFICATIONS = 256
 
 
 class NotificationManager:
@@ -47,21 +66,30 @@ class NotificationManager:
         """初始化通知管理器"""
         self.toaster = ToastNotifier() if NOTIFICATION_AVAILABLE else None
         self.icon_path = self._get_icon_path()
-        self.active_notifications = {}  # 存储活动通知的回调函数
+        self.active_notifications = OrderedDict()  # 存储活动通知的回调函数
         
-    def _get_icon_path(self) -> str:
-        """获取通知图标路径"""
-        # 在实际应用中，图标应该放在应用安装目录下
-        # 这里使用一个临时路径
-        app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        icon_path = os.path.join(app_dir, "assets", "icon.ico")
+        # 多条通知由一个后台调度线程依次显示，调用方无需等待通知之间的间隔。
+        # 通知功能不可用时不启动调度线程
+        self._notification_queue = queue.Queue()
+        self._closing = threading.Event()
+        self._scheduler_thread = None
+        if NOTIFICATION_AVAILABLE:
+            self._scheduler_thread = threading.Thread(
+                target=self._scheduler_loop,
+                name="NotificationScheduler",
+                daemon=True
+            )
+            self._scheduler_thread.start()
         
-        # 如果图标不存在，返回None
-        if not os.path.exists(icon_path):
-            logger.warning(f"通知图标不存在: {icon_path}")
-            return None
+        # 通知在常驻的单线程线程池中显示，win10toast不支持同时显示多个通知；
+        # 线程池随close()一起关闭
+        self._toast_pool = None
+        if NOTIFICATION_AVAILABLE:
+            self._toast_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="toast")
         
-        return icon_path
+    def _get_icon_path(self) -> str:
+        """获取通知图标路径"""
+        return _find_icon_path()
     
     def show_news_notification(self, news_item: NewsItem) -> bool:
         """显示新闻通知
@@ -72,7 +100,7 @@ class NotificationManager:
         Returns:
             是否成功显示通知
         """
-        if not NOTIFICATION_AVAILABLE or self.toaster is None:
+        if not NOTIFICATION_AVAILABLE or self.toaster is None or self._toast_pool is None:
             logger.warning("通知功能不可用")
             return False
         
@@ -82,48 +110,80 @@ class NotificationManager:
             message = news_item.title
             
             # 创建点击回调函数
-            def callback_func():
-                self._on_notification_clicked(news_item.link, news_item.id)
+            callback_func = functools.partial(self._on_notification_clicked, news_item.link, news_item.id)
             
-            # 存储回调函数，防止被垃圾回收
+            # 存储回调函数，防止被垃圾回收；未被点击的通知按先后顺序淘汰
             self.active_notifications[news_item.id] = callback_func
+            if len(self.active_notifications) > _MAX_ACTIVE_NOTIFICATIONS:
+                self.active_notifications.popitem(last=False)
             
             # 显示通知
-            threading.Thread(
-                target=self.toaster.show_toast,
-                args=(title, message, self.icon_path, 5, callback_func),
-                daemon=True
-            ).start()
+            self._toast_pool.submit(self.toaster.show_toast, title, message, self.icon_path, 5, callback_func)
             
-            logger.info(f"显示新闻通知: {title} - {message}")
+            logger.info("显示新闻通知: %s - %s", title, message)
             return True
         except Exception as e:
-            logger.error(f"显示新闻通知失败: {str(e)}")
+            logger.error("显示新闻通知失败: %s", e)
             return False
     
     def show_multiple_news_notifications(self, news_items: List[NewsItem], delay: float = 2.0) -> int:
         """显示多条新闻通知，每条之间有延迟
         
+        通知交给后台调度线程依次显示，本方法立即返回。
+        
         Args:
             news_items: 新闻条目列表
             delay: 每条通知之间的延迟（秒）
             
         Returns:
-            成功显示的通知数量
+            加入显示队列的通知数量。通知在后台显示，返回值不表示已成功显示的数量；
+            通知功能不可用或管理器已关闭时返回0
         """
         if not news_items:
             return 0
         
-        success_count = 0
+        if not NOTIFICATION_AVAILABLE or self.toaster is None or self._scheduler_thread is None:
+            logger.warning("通知功能不可用")
+            return 0
+        
+        if self._closing.is_set():
+            logger.warning("通知管理器已关闭")
+            return 0
+        
         for item in news_items:
-            if self.show_news_notification(item):
-                success_count += 1
-                
-                # 等待一段时间再显示下一条通知
-                if success_count < len(news_items):
-                    time.sleep(delay)
+            self._notification_queue.put((item, delay))
         
-        return success_count
+        return len(news_items)
+    
+    def _scheduler_loop(self):
+        """后台调度线程主循环，依次显示队列中的通知，收到None时退出"""
+        while True:
+            item = self._notification_queue.get()
+            if item is None or self._closing.is_set():
+                break
+            
+            news_item, delay = item
+            
+            # 队列中还有通知时等待一段时间再显示下一条；关闭时立即结束等待
+            if self.show_news_notification(news_item) and not self._notification_queue.empty():
+                self._closing.wait(delay)
+    
+    def close(self):
+        """关闭通知管理器，停止后台调度线程和通知线程池，尚未显示的通知将被丢弃
+        
+        应在应用退出时调用。
+        """
+        if self._closing.is_set():
+            return
+        self._closing.set()
+        
+        if self._scheduler_thread is not None:
+            self._notification_queue.put(None)
+            self._scheduler_thread.join()
+        
+        # 正在显示的通知不必等待结束
+        if self._toast_pool is not None:
+            self._toast_pool.shutdown(wait=False, cancel_futures=True)
     
     def _on_notification_clicked(self, url: str, news_id: str):
         """通知点击事件处理
@@ -133,22 +193,28 @@ class NotificationManager:
             news_id: 新闻ID
         """
         try:
-            # 打开浏览器访问新闻链接
+            # 打开浏览器访问新闻链接，webbrowser只在点击通知时需要，按需导入
+            import webbrowser
             webbrowser.open(url)
-            logger.info(f"打开新闻链接: {url}")
+            logger.info("打开新闻链接: %s", url)
             
             # 从活动通知中移除
-            if news_id in self.active_notifications:
-                del self.active_notifications[news_id]
+            self.active_notifications.pop(news_id, None)
             
             # 在实际应用中，这里应该调用数据存储模块将新闻标记为已读
             # 例如：storage.mark_as_read(news_id)
         except Exception as e:
-            logger.error(f"处理通知点击事件失败: {str(e)}")
+            logger.error("处理通知点击事件失败: %s", e)
 
 
 # 测试代码
 if __name__ == "__main__":
+    # 单独运行本模块时配置日志
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
     from src.news_fetcher import NewsItem
     from datetime import datetime
     
@@ -179,3 +245,4 @@ if __name__ == "__main__":
     # 保持程序运行一段时间，以便查看通知
     print("通知已发送，程序将在10秒后退出...")
     time.sleep(10)
+    notification_manager.close()
@@ -4,9 +4,15 @@
 import os
 import sys
 import shutil
+import hashlib
+import zipfile
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# 记录上次打包时源代码摘要的缓存文件
+PACKAGE_CACHE_FILE = '.pkg_cache'
+
 # PyInstaller配置文件
 SPEC_CONTENT = """
 # -*- mode: python ; coding: utf-8 -*-
@@ -63,9 +69,11 @@ coll = COLLECT(
 # 依赖列表
 REQUIREMENTS = """
 PyQt6>=6.4.0
-feedparser>=6.0.10
+lxml>=4.9.0
 win10toast-click>=0.1.2
 requests>=2.28.1
+aiohttp>=3.8.0
+pyahocorasick>=2.0.0
 """
 
 # 安装说明
@@ -246,32 +254,90 @@ def create_package_files():
         f.write(USER_MANUAL.strip())
     print("已创建用户手册.md")
 
+def _source_tree_digest(paths) -> str:
+    """计算源代码树的摘要
+    
+    目录中的文件按路径、修改时间和大小计算；单独列出的文件按内容计算，
+    因为打包文档每次都会重新生成，修改时间总会变化。
+    
+    Args:
+        paths: 参与计算的目录或文件路径
+    
+    Returns:
+        十六进制摘要字符串
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        if os.path.isfile(path):
+            with open(path, 'rb') as f:
+                digest.update(f"{path}|".encode('utf-8') + f.read() + b"\n")
+            continue
+        
+        files = [
+            os.path.join(root, name)
+            for root, dirs, names in os.walk(path)
+            for name in names
+        ]
+        for file_path in sorted(files):
+            stat = os.stat(file_path)
+            digest.update(f"{file_path}|{stat.st_mtime_ns}|{stat.st_size}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def _zip_directory(source_dir: str, zip_path: str):
+    """将目录压缩为ZIP文件，使用较低的压缩级别换取速度
+    
+    Args:
+        source_dir: 要压缩的目录
+        zip_path: ZIP文件路径
+    """
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for root, dirs, names in os.walk(source_dir):
+            for name in names:
+                file_path = os.path.join(root, name)
+                zf.write(file_path, os.path.relpath(file_path, source_dir))
+
 def create_source_package():
     """创建源代码包"""
+    zip_path = 'ai_news_notifier_source.zip'
+    docs = ['安装说明.md', '用户手册.md', 'requirements.txt']
+    temp_dir = 'temp_source'
     try:
+        # 源代码、资源和文档都没有变化时跳过重新打包
+        digest = _source_tree_digest(['src', 'assets'] + docs)
+        if os.path.exists(zip_path) and os.path.exists(PACKAGE_CACHE_FILE):
+            with open(PACKAGE_CACHE_FILE, 'r', encoding='utf-8') as f:
+                if f.read().strip() == digest:
+                    print(f"源代码未变化，跳过创建源代码包: {zip_path}")
+                    return
+        
         # 创建临时目录
-        temp_dir = 'temp_source'
         os.makedirs(temp_dir, exist_ok=True)
         
-        # 复制源代码
-        shutil.copytree('src', os.path.join(temp_dir, 'src'))
-        
-        # 复制资源
-        shutil.copytree('assets', os.path.join(temp_dir, 'assets'))
+        # 同时复制源代码和资源
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(shutil.copytree, 'src', os.path.join(temp_dir, 'src')),
+                executor.submit(shutil.copytree, 'assets', os.path.join(temp_dir, 'assets'))
+            ]
+            for future in futures:
+                future.result()
         
         # 复制文档
-        shutil.copy('安装说明.md', temp_dir)
-        shutil.copy('用户手册.md', temp_dir)
-        shutil.copy('requirements.txt', temp_dir)
+        for doc in docs:
+            shutil.copy(doc, temp_dir)
         
         # 创建ZIP文件
-        shutil.make_archive('ai_news_notifier_source', 'zip', temp_dir)
-        print("已创建源代码包: ai_news_notifier_source.zip")
+        _zip_directory(temp_dir, zip_path)
+        print(f"已创建源代码包: {zip_path}")
         
-        # 清理临时目录
-        shutil.rmtree(temp_dir)
+        # 记录本次打包的源代码摘要
+        with open(PACKAGE_CACHE_FILE, 'w', encoding='utf-8') as f:
+            f.write(digest)
     except Exception as e:
         print(f"创建源代码包时出错: {str(e)}")
+    finally:
+        # 清理临时目录
+        shutil.rmtree(temp_dir, ignore_errors=True)
 
 def create_executable():
     """创建可执行文件"""
@@ -1,11 +1,16 @@
 """
 测试模块 - 用于测试软件各个功能
 """
+import json
 import os
 import sys
 import logging
+import sqlite3
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
 # 配置日志
 logging.basicConfig(
@@ -16,8 +21,8 @@ logger = logging.getLogger('test_module')
 
 # 导入自定义模块
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.news_fetcher import NewsFetcher, NewsItem
-from src.data_storage import DataStorage
+from src.news_fetcher import NewsFetcher, NewsItem, LXML_AVAILABLE, _MAX_FEED_ENTRIES, _parse_feed, _parse_feed_time
+from src.data_storage import DataStorage, _SCHEMA_VERSION
 from src.notification import NotificationManager
 
 def test_news_fetcher():
@@ -48,6 +53,133 @@ def test_news_fetcher():
     
     return len(all_items) > 0
 
+def test_feed_time_parsing():
+    """测试订阅源发布时间解析"""
+    logger.info("开始测试订阅源发布时间解析...")
+    
+    # 各种写法的发布时间及其对应的UTC时间
+    cases = [
+        ("Sat, 24 May 2025 10:30:00 GMT", datetime(2025, 5, 24, 10, 30)),
+        ("Sat, 24 May 2025 10:30:00 +0000", datetime(2025, 5, 24, 10, 30)),
+        ("Sat, 24 May 2025 10:30:00 -0400", datetime(2025, 5, 24, 14, 30)),
+        ("Sat, 24 May 2025 10:30:00 +0800", datetime(2025, 5, 24, 2, 30)),
+        ("Sat, 24 May 2025 10:30:00 EST", datetime(2025, 5, 24, 15, 30)),
+        ("Sat, 24 May 2025 10:30:00 PDT", datetime(2025, 5, 24, 17, 30)),
+        ("Sat, 4 May 2025 10:30:00 GMT", datetime(2025, 5, 4, 10, 30)),
+        ("2025-05-24T10:30:00Z", datetime(2025, 5, 24, 10, 30)),
+        ("2025-05-24T10:30:00+08:00", datetime(2025, 5, 24, 2, 30)),
+    ]
+    
+    all_passed = True
+    for value, expected in cases:
+        try:
+            result = _parse_feed_time(value)
+        except ValueError as e:
+            logger.error(f"解析发布时间失败: {value} ({str(e)})")
+            all_passed = False
+            continue
+        if result != expected:
+            logger.error(f"发布时间解析错误: {value} -> {result}，应为{expected}")
+            all_passed = False
+    
+    # 无法解析的时间应抛出ValueError，由调用方改用获取时间
+    try:
+        _parse_feed_time("not a date")
+        logger.error("无法解析的发布时间没有抛出ValueError")
+        all_passed = False
+    except ValueError:
+        pass
+    
+    return all_passed
+
+def test_feed_parsing():
+    """测试订阅源XML解析"""
+    logger.info("开始测试订阅源XML解析...")
+    
+    if not LXML_AVAILABLE:
+        logger.warning("lxml库未安装，跳过订阅源XML解析测试")
+        return True
+    
+    all_passed = True
+    
+    def check(name, result, expected):
+        nonlocal all_passed
+        if result != expected:
+            logger.error(f"{name}解析错误: {result}，应为{expected}")
+            all_passed = False
+    
+    # RSS 2.0：CDATA标题和首尾空白，缺少链接或标题为空的条目被跳过
+    rss = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel>
+<title>Feed</title>
+<item>
+  <title>  <![CDATA[AI <b>突破</b> & 新进展]]>  </title>
+  <link>
+    https://example.com/rss1
+  </link>
+  <pubDate>Sat, 24 May 2025 10:30:00 GMT</pubDate>
+</item>
+<item><title>没有链接</title></item>
+<item><title></title><link>https://example.com/empty-title</link></item>
+<item><title>没有发布时间</title><link>https://example.com/rss2</link></item>
+</channel></rss>""".encode("utf-8")
+    check("RSS订阅源", _parse_feed(rss), [
+        {"title": "AI <b>突破</b> & 新进展", "link": "https://example.com/rss1",
+         "published": "Sat, 24 May 2025 10:30:00 GMT"},
+        {"title": "没有发布时间", "link": "https://example.com/rss2"},
+    ])
+    
+    # Atom：跳过rel="self"的链接，使用alternate或未指定rel的链接，没有published时使用updated
+    atom = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+<title>Feed</title>
+<entry>
+  <title>Atom条目1</title>
+  <link rel="self" href="https://example.com/self1"/>
+  <link rel="alternate" href="https://example.com/atom1"/>
+  <published>2025-05-24T10:30:00Z</published>
+</entry>
+<entry>
+  <title>Atom条目2</title>
+  <link rel="self" href="https://example.com/self2"/>
+  <link href="https://example.com/atom2"/>
+  <updated>2025-05-24T11:00:00+08:00</updated>
+</entry>
+<entry>
+  <title>只有self链接</title>
+  <link rel="self" href="https://example.com/self3"/>
+</entry>
+</feed>""".encode("utf-8")
+    check("Atom订阅源", _parse_feed(atom), [
+        {"title": "Atom条目1", "link": "https://example.com/atom1", "published": "2025-05-24T10:30:00Z"},
+        {"title": "Atom条目2", "link": "https://example.com/atom2", "published": "2025-05-24T11:00:00+08:00"},
+    ])
+    
+    # 条目很多的订阅源只提取前_MAX_FEED_ENTRIES条
+    items = "".join(
+        f"<item><title>条目{i}</title><link>https://example.com/{i}</link></item>" for i in range(200)
+    )
+    entries = _parse_feed(f'<rss version="2.0"><channel>{items}</channel></rss>'.encode("utf-8"))
+    check("长订阅源", [entry["title"] for entry in entries], [f"条目{i}" for i in range(_MAX_FEED_ENTRIES)])
+    
+    # 外部实体不应被展开，文件内容不能出现在解析结果中
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as secret_file:
+        secret_file.write("SECRET-FILE-CONTENT")
+    try:
+        entity_feed = f"""<?xml version="1.0"?>
+<!DOCTYPE rss [<!ENTITY x SYSTEM "{Path(secret_file.name).as_uri()}">]>
+<rss version="2.0"><channel>
+<item><title>实体 &x;</title><link>https://example.com/entity</link></item>
+</channel></rss>""".encode("utf-8")
+        entries = _parse_feed(entity_feed)
+    finally:
+        os.remove(secret_file.name)
+    if any("SECRET-FILE-CONTENT" in entry["title"] for entry in entries):
+        logger.error(f"外部实体被展开: {entries}")
+        all_passed = False
+    
+    return all_passed
+
 def test_data_storage():
     """测试数据存储模块"""
     logger.info("开始测试数据存储模块...")
@@ -89,6 +221,9 @@ def test_data_storage():
     if latest_news:
         result = storage.mark_as_read(latest_news[0].id)
         logger.info(f"标记新闻为已读: {'成功' if result else '失败'}")
+        
+        # 等待后台写线程提交
+        storage.flush()
     
     # 测试获取未读新闻
     unread_news = storage.get_unread_news(5)
@@ -99,11 +234,126 @@ def test_data_storage():
     value = storage.get_setting("test_key")
     logger.info(f"保存和获取设置: {'成功' if value == 'test_value' else '失败'}")
     
-    # 清理测试文件
+    # 关闭数据库连接并清理测试文件
+    storage.close()
     if os.path.exists(test_db_path):
         os.remove(test_db_path)
     
-    return saved_count == len(test_news) and len(latest_news) > 0
+    # 关闭后的写操作应返回失败，而不是抛出异常
+    closed_ok = not storage.save_setting("test_key", "other_value") and storage.insert_news_items(test_news) == []
+    logger.info(f"关闭后写入数据库: {'正确返回失败' if closed_ok else '结果错误'}")
+    
+    return saved_count == len(test_news) and len(latest_news) > 0 and closed_ok
+
+def test_schema_migration():
+    """测试旧版本数据库的结构升级，以及各种类型设置值的保存和读取"""
+    logger.info("开始测试数据库结构升级...")
+    
+    test_db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_old_news_data.db")
+    if os.path.exists(test_db_path):
+        os.remove(test_db_path)
+    
+    # 容易出错的设置值类型：布尔值与整数、超出INTEGER范围的整数、经过JSON编码的其他值
+    settings = {
+        "flag_true": True,
+        "flag_false": False,
+        "count": 1,
+        "zero": 0,
+        "negative": -2 ** 63,
+        "big_int": 2 ** 63,
+        "huge_int": -(2 ** 70),
+        "ratio": 0.5,
+        "name": "设置值",
+        "items": [1, "a", None],
+        "mapping": {"a": 1, "b": [True]},
+        "nothing": None,
+    }
+    
+    # 按旧版本的表结构建库：published_time为ISO-8601文本，设置值为JSON文本，user_version为0
+    published_times = [datetime(2025, 5, 24, 10, 30), datetime(2025, 5, 23, 8, 5)]
+    conn = sqlite3.connect(test_db_path)
+    conn.execute('''
+    CREATE TABLE news_items (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        link TEXT NOT NULL,
+        source TEXT NOT NULL,
+        published_time TEXT NOT NULL,
+        category TEXT NOT NULL,
+        is_read INTEGER NOT NULL DEFAULT 0
+    )
+    ''')
+    conn.execute("CREATE TABLE settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    conn.executemany(
+        "INSERT INTO news_items VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("id1", "旧新闻1", "https://example.com/old1", "来源1", published_times[0].isoformat(), "AI", 1),
+            ("id2", "旧新闻2", "https://example.com/old2", "来源2", published_times[1].isoformat(), "科技", 0),
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO settings (key, value) VALUES (?, ?)",
+        [(key, json.dumps(value)) for key, value in settings.items()]
+    )
+    conn.commit()
+    conn.close()
+    
+    all_passed = True
+    
+    def check_settings(storage, stage):
+        nonlocal all_passed
+        for key, expected in settings.items():
+            value = storage.get_setting(key)
+            # 比较类型，避免True与1、0.0与0被视为相同
+            if value != expected or type(value) is not type(expected):
+                logger.error(f"{stage}设置{key}的值为{value!r}，应为{expected!r}")
+                all_passed = False
+    
+    storage = DataStorage(test_db_path)
+    try:
+        check_settings(storage, "升级后")
+        
+        # 按新格式重新保存一遍，再从数据库（而不是内存缓存）读取
+        storage.save_settings_bulk(settings)
+        
+        rows = [tuple(row) for row in storage.get_latest_rows(10)]
+        expected_rows = [
+            ("id1", "旧新闻1", "https://example.com/old1", "来源1", int(published_times[0].timestamp()), "AI", 1,
+             "2025-05-24 10:30"),
+            ("id2", "旧新闻2", "https://example.com/old2", "来源2", int(published_times[1].timestamp()), "科技", 0,
+             "2025-05-23 08:05"),
+        ]
+        if rows != expected_rows:
+            logger.error(f"升级后的新闻数据错误: {rows}，应为{expected_rows}")
+            all_passed = False
+    finally:
+        storage.close()
+    
+    storage = DataStorage(test_db_path)
+    try:
+        check_settings(storage, "重新打开后")
+    finally:
+        storage.close()
+    
+    conn = sqlite3.connect(test_db_path)
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        column_types = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(news_items)")}
+        settings_columns = {row[1] for row in conn.execute("PRAGMA table_info(settings)")}
+    finally:
+        conn.close()
+    if version != _SCHEMA_VERSION:
+        logger.error(f"升级后的数据库版本为{version}，应为{_SCHEMA_VERSION}")
+        all_passed = False
+    if column_types.get("published_time") != "INTEGER":
+        logger.error(f"升级后published_time的类型为{column_types.get('published_time')}，应为INTEGER")
+        all_passed = False
+    if settings_columns != {"key", "value_type", "value_int", "value_text"}:
+        logger.error(f"升级后settings表的列为{settings_columns}")
+        all_passed = False
+    
+    os.remove(test_db_path)
+    return all_passed
 
 def test_notification():
     """测试通知模块"""
@@ -130,28 +380,47 @@ def test_notification():
     logger.info("等待3秒...")
     time.sleep(3)
     
+    # 停止通知调度线程
+    notification_manager.close()
+    
     return True
 
+def run_test(name, test_func):
+    """运行单个测试，出错时视为失败
+    
+    Args:
+        name: 测试名称
+        test_func: 测试函数
+    
+    Returns:
+        测试是否通过
+    """
+    logger.info(f"测试{name}...")
+    try:
+        result = test_func()
+        logger.info(f"{name}测试{'通过' if result else '失败'}")
+        return result
+    except Exception as e:
+        logger.error(f"{name}测试出错: {str(e)}")
+        return False
+
 def run_all_tests():
     """运行所有测试"""
     logger.info("开始运行所有测试...")
     
     tests = [
         ("新闻获取模块", test_news_fetcher),
+        ("发布时间解析", test_feed_time_parsing),
+        ("订阅源解析", test_feed_parsing),
         ("数据存储模块", test_data_storage),
+        ("数据库结构升级", test_schema_migration),
         ("通知模块", test_notification)
     ]
     
-    results = []
-    for name, test_func in tests:
-        logger.info(f"测试{name}...")
-        try:
-            result = test_func()
-            results.append((name, result))
-            logger.info(f"{name}测试{'通过' if result else '失败'}")
-        except Exception as e:
-            logger.error(f"{name}测试出错: {str(e)}")
-            results.append((name, False))
+    # 各测试互不依赖，并行运行，总耗时取决于最慢的测试
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        futures = [(name, executor.submit(run_test, name, test_func)) for name, test_func in tests]
+        results = [(name, future.result()) for name, future in futures]
     
     # 打印测试结果摘要
     logger.info("\n测试结果摘要:")